@@ -0,0 +1,82 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Optional
+import zstandard
+
+# Expired rows are pruned once every this many writes
+PRUNE_EVERY_WRITES = 100
+
+class PersistentCache:
+    """String key/value cache stored in SQLite, with zstd-compressed values and a TTL.
+
+    Survives restarts and is shared by all uvicorn workers on the host.
+    """
+
+    def __init__(self, db_path, table: str, ttl_seconds: float):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self._compressor = zstandard.ZstdCompressor()
+        self._decompressor = zstandard.ZstdDecompressor()
+        # Calls run in worker threads; the connection and the zstd contexts are
+        # not safe to use from several threads at once
+        self._lock = threading.Lock()
+        self._writes = 0
+        # Autocommit; WAL lets several worker processes read while one writes
+        self._conn = sqlite3.connect(db_path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        # Drop whatever expired while the server was down
+        self._prune()
+        # Setup above may wait on other workers starting up; after that a short
+        # busy timeout turns lock contention into a quick cache miss
+        self._conn.execute("PRAGMA busy_timeout = 200")
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None if missing or expired"""
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str):
+        """Store value under key for ttl_seconds"""
+        await asyncio.to_thread(self._set, key, value)
+
+    def _get(self, key: str) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    f"SELECT value FROM {self.table} WHERE key = ? AND expires_at >= ?",
+                    (key, time.time())
+                ).fetchone()
+                if row is None:
+                    return None
+                return self._decompressor.decompress(row[0]).decode()
+        except (sqlite3.Error, zstandard.ZstdError) as e:
+            # A cache failure (locked database, corrupt entry, ...) is just a miss
+            print(f"Error reading {self.table} cache: {str(e)}")
+            return None
+
+    def _set(self, key: str, value: str):
+        try:
+            with self._lock:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, self._compressor.compress(value.encode()), time.time() + self.ttl_seconds)
+                )
+                # Reads skip expired rows but never remove them, so clean up as we go
+                self._writes += 1
+                if self._writes % PRUNE_EVERY_WRITES == 0:
+                    self._prune()
+        except sqlite3.Error as e:
+            # Failing to cache must never fail the request that produced the value
+            print(f"Error writing {self.table} cache: {str(e)}")
+
+    def _prune(self):
+        try:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+        except sqlite3.Error as e:
+            # Another worker may be pruning at the same time; try again later
+            print(f"Error pruning {self.table} cache: {str(e)}")
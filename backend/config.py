@@ -1,20 +1,29 @@
-import os
 from pathlib import Path
 from datetime import datetime
 
 # Base directory for saved articles
 BASE_DIR = Path(__file__).resolve().parent
-SAVED_ARTICLES_DIR = os.path.join(BASE_DIR, "saved_articles")
+SAVED_ARTICLES_DIR = BASE_DIR / "saved_articles"
 
 # Create the base directory if it doesn't exist
-os.makedirs(SAVED_ARTICLES_DIR, exist_ok=True)
+SAVED_ARTICLES_DIR.mkdir(parents=True, exist_ok=True)
+
+# SQLite file backing the search and ranking caches
+CACHE_DB_PATH = BASE_DIR / "llm_cache.db"
 
 # API settings
 MAX_RESULTS = 25
 
+# Today's folder, remembered until the date rolls over
+_cached_date = None
+_cached_folder = None
+
 def get_today_folder():
     """Get the folder path for today's date in YYYYMMDD format"""
+    global _cached_date, _cached_folder
     today = datetime.now().strftime("%Y%m%d")
-    folder_path = os.path.join(SAVED_ARTICLES_DIR, today)
-    os.makedirs(folder_path, exist_ok=True)
-    return folder_path 
\ No newline at end of file
+    if today != _cached_date:
+        folder_path = SAVED_ARTICLES_DIR / today
+        folder_path.mkdir(parents=True, exist_ok=True)
+        _cached_date, _cached_folder = today, folder_path
+    return _cached_folder
@@ -1,22 +1,34 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import arxiv
+import asyncio
+import aiofiles
+import aiofiles.os
+import aiohttp
+import hashlib
+import heapq
+import io
+import itertools
 import json
+from cachetools import TTLCache
 from datetime import datetime
-from config import SAVED_ARTICLES_DIR, MAX_RESULTS, get_today_folder
-from pydantic import BaseModel
+from config import SAVED_ARTICLES_DIR, MAX_RESULTS, CACHE_DB_PATH, get_today_folder
+from cache import PersistentCache
+from pydantic import BaseModel, TypeAdapter
 from dotenv import load_dotenv
-from typing import List, Optional, Dict
+from typing import Awaitable, Callable, List, Optional, Dict, Tuple
+from pathlib import Path
 import os
 import re
-from openai import OpenAI
+import uuid
+from openai import AsyncOpenAI
 
 app = FastAPI()
 
 # Configure OpenAI
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=openai_api_key)
+client = AsyncOpenAI(api_key=openai_api_key)
 
 # Enable CORS
 app.add_middleware(
@@ -27,6 +39,103 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def open_http_session():
+    # One keep-alive pool shared by all downloads, so repeat requests to
+    # arxiv.org reuse sockets instead of redoing the TCP/TLS handshake
+    connector = aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=60)
+    app.state.http = aiohttp.ClientSession(connector=connector)
+
+@app.on_event("shutdown")
+async def close_http_session():
+    await app.state.http.close()
+
+# Recent arxiv search results keyed by (whitespace-normalized query, max_results)
+arxiv_cache = TTLCache(maxsize=512, ttl=600)
+arxiv_store = PersistentCache(CACHE_DB_PATH, "arxiv_searches", ttl_seconds=600)
+
+# Raw LLM ranking responses keyed by exact (profile, article set, num_results)
+ranking_cache = TTLCache(maxsize=1024, ttl=3600)
+# On-disk copy of ranking responses, kept across restarts
+ranking_store = PersistentCache(CACHE_DB_PATH, "ranking_responses", ttl_seconds=7 * 24 * 3600)
+# Profile embeddings and their responses per article set, for paraphrased profiles
+ranking_semantic_index = TTLCache(maxsize=256, ttl=3600)
+SEMANTIC_CACHE_THRESHOLD = 0.92
+# Most recent profiles kept per article set; bounds memory and the similarity scan
+SEMANTIC_CACHE_MAX_NEIGHBOURS = 8
+# In-flight ranking calls keyed like ranking_cache, so concurrent identical
+# searches share a single LLM request
+pending_rankings: Dict[str, asyncio.Task] = {}
+# Starts (once) and returns the shared embedding of the profile being ranked
+ProfileEmbedding = Callable[[], Awaitable[Optional[List[float]]]]
+
+# Above this many articles, ranking is split into concurrent LLM calls
+CHUNKED_RANKING_THRESHOLD = 50
+RANKING_CHUNK_SIZE = 10
+
+RANKING_MODEL = "gpt-4.1-mini-2025-04-14"
+
+# Static ranking instructions. Kept as the leading system message, ahead of any
+# per-request content, so OpenAI prompt caching can reuse it across requests
+# (caching only applies to exact prefixes of at least 1024 tokens).
+RANKING_SYSTEM_PROMPT = """You are a research paper recommendation system. Your task is to analyze articles and match them with a user's research profile. Provide detailed reasoning for your selections.
+
+The user message contains a user profile followed by a numbered list of articles. Analyze and rank the articles based on their relevance to the user's research profile, expertise, and interests.
+
+For each article, provide:
+1. A relevance score (0-100)
+2. A brief explanation of why this article matches or doesn't match the profile
+
+Scoring rubric. Apply it consistently so that scores are comparable between articles and between requests:
+- 90-100: The article is squarely within the user's stated research focus. It addresses the same problem, uses or advances the same methods, or studies the same systems the user works on. A researcher with this profile would want to read it immediately.
+- 75-89: The article is closely related. It shares the main problem or method but applies it in a neighbouring setting, or it is a strong foundational or survey paper for the user's area.
+- 50-74: The article is partially relevant. It overlaps with one important aspect of the profile (a method, a dataset, an application domain or a theoretical tool) while the rest of the work is outside the user's interests.
+- 25-49: The article is tangentially relevant. The connection is indirect, for example a shared broad field, a technique the user might borrow, or an application the user has mentioned only in passing.
+- 0-24: The article is not relevant to the profile. Use the low end of this range for articles from unrelated fields.
+
+When judging relevance:
+- Weigh the user's explicitly stated interests and current projects above their general background.
+- Consider the user's expertise level. Prefer articles that match it: an expert in a topic gains little from an introductory tutorial, and a newcomer may benefit from surveys and foundational work.
+- Judge each article on its title and summary only. Do not assume results, methods or claims that are not described.
+- Do not reward an article for sharing keywords with the profile if the substance of the work is different. Terms such as "model", "network", "graph", "kernel" or "transformer" mean different things in different fields.
+- Do not penalize an article for being recent, short or from a less known venue.
+- Score every article in the list exactly once, using its article number as given. Never invent article numbers and never skip an article.
+- Articles with the same relevance may share a score, but use the full range of the rubric rather than clustering every score around the middle.
+
+Handling difficult cases:
+- If the profile spans several fields, score each article against the field it is closest to. Do not lower a score because the article covers only one of the user's interests.
+- If the profile is short or vague, rely on the concrete topics, methods and systems it does mention, and keep the explanations cautious about what the user may or may not know.
+- If the profile lists topics the user wants to avoid, score articles centred on those topics in the 0-24 band even when they are otherwise close to the user's field.
+- If two articles describe the same work, for example two versions of one paper or a paper and its extended version, score them the same and mention the overlap in the explanation of the later one.
+- If an article is interdisciplinary, credit the part that overlaps with the profile and note briefly which part falls outside it.
+- If the summary of an article is missing, truncated or uninformative, score it from its title alone and say so in the explanation.
+- If no article is a good match, still rank all of them with honest low scores, and say in the summary that the list contains no strong match.
+- If the profile is written in a language other than English, apply the same rubric and write the explanations and summary in English.
+
+Writing explanations:
+- Keep each explanation to one or two sentences.
+- Name the specific aspect of the profile the article connects to, or state plainly why it does not connect.
+- Do not restate the title or summary of the article.
+- Write in a neutral, factual tone addressed to the user.
+
+Writing the summary:
+- In two to four sentences, describe which themes of the profile drove the ranking, which articles stood out and why, and any notable gaps, for example when no article matches a stated interest.
+
+Format of the response. The response is a JSON object with two fields:
+- rankings: one entry per article, listed from the highest score to the lowest. Each entry has article_num (the article number as given in the list), score (the relevance score from 0 to 100) and explanation (the explanation for that article).
+- summary: a brief overall explanation of your ranking decisions.
+
+Do not use markdown formatting inside the explanations or the summary."""
+
+# Read size for streaming PDFs to disk; keeps memory flat regardless of paper size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Chunks are buffered and written in batches of this size, so each file write
+# (one thread-pool hop and one syscall through aiofiles) covers 8 chunks
+WRITE_BUFFER_SIZE = 8 * DOWNLOAD_CHUNK_SIZE
+
+# Everything but letters and digits, stripped when comparing titles
+NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
 class Article(BaseModel):
     title: str
     description: str
@@ -42,119 +151,321 @@ class SearchResponse(BaseModel):
     articles: List[RankedArticle]
     llm_reasoning: str
 
-def sanitize_filename(title):
-    """Convert title to a valid filename"""
-    # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', title)
-    # Replace spaces with underscores
-    filename = filename.replace(' ', '_')
-    # Limit length
-    return filename[:100]
+class RankingItem(BaseModel):
+    article_num: int
+    score: float
+    explanation: str
+
+class RankingOutput(BaseModel):
+    """Structured output schema for the LLM ranking response"""
+    rankings: List[RankingItem]
+    summary: str
+
+# (De)serializes cached arxiv results
+ARTICLE_LIST = TypeAdapter(List[Article])
+
+# Persisted cache entries outlive deploys, so their keys include everything that
+# shapes the stored payload; changing any of it starts a fresh set of entries
+RANKING_CACHE_VERSION = hashlib.sha256("|".join([
+    RANKING_MODEL,
+    RANKING_SYSTEM_PROMPT,
+    json.dumps(RankingOutput.model_json_schema(), sort_keys=True)
+]).encode()).hexdigest()[:16]
+ARXIV_CACHE_VERSION = hashlib.sha256(
+    json.dumps(ARTICLE_LIST.json_schema(), sort_keys=True).encode()
+).hexdigest()[:16]
+
+def to_ranked_article(article: Article, score: float, reasoning: str, article_id: int) -> RankedArticle:
+    """Extend an already validated Article with its ranking, without revalidating"""
+    return RankedArticle.model_construct(
+        **article.__dict__,
+        score=score,
+        reasoning=reasoning,
+        article_id=article_id
+    )
+
+# Version suffix of an arxiv ID, e.g. the "v2" in 2101.00001v2
+ARXIV_VERSION = re.compile(r'v\d+$')
+
+def get_arxiv_id(link):
+    """Extract the arxiv ID, without version suffix, from an article link"""
+    # Old-style IDs keep their archive prefix, e.g. hep-th/9901001
+    return ARXIV_VERSION.sub('', link.split('/abs/', 1)[-1])
+
+def dedupe_articles(articles: List[Article]) -> List[Article]:
+    """Drop other versions of the same paper and near-identical titles, keeping the first"""
+    seen_ids = set()
+    seen_titles = set()
+    unique = []
+    for article in articles:
+        arxiv_id = get_arxiv_id(article.link)
+        title_key = NON_ALNUM.sub('', article.title.lower())
+        if arxiv_id in seen_ids or (title_key and title_key in seen_titles):
+            continue
+        seen_ids.add(arxiv_id)
+        seen_titles.add(title_key)
+        unique.append(article)
+    return unique
+
+async def download_one(session: aiohttp.ClientSession, article: Article, folder_path: Path):
+    """Stream a single article's PDF from arxiv into folder_path"""
+    # The PDF URL is deterministic, so no metadata lookup is needed
+    arxiv_id = get_arxiv_id(article.link)
+    file_name = f"{arxiv_id.replace('/', '_')}.pdf"
+    file_path = folder_path / file_name
+    # Stream into a temporary file so a failed download never leaves a truncated PDF;
+    # the name is unique so concurrent saves of the same paper never share it
+    part_path = folder_path / f"{file_name}.{uuid.uuid4().hex}.part"
+
+    try:
+        async with session.get(f"https://arxiv.org/pdf/{arxiv_id}.pdf") as response:
+            response.raise_for_status()
+            async with aiofiles.open(part_path, 'wb') as f:
+                buffer = bytearray()
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    buffer += chunk
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        await f.write(buffer)
+                        buffer.clear()
+                if buffer:
+                    await f.write(buffer)
+        await aiofiles.os.replace(part_path, file_path)
+
+        return file_name, None
+    except Exception as article_error:
+        print(f"Error processing article {article.title}: {str(article_error)}")
+        if await aiofiles.os.path.exists(part_path):
+            await aiofiles.os.remove(part_path)
+        return None, article_error
+
+async def get_ranking_response(articles: List[Article], profile: str, num_results: int, offset: int, prompt: str, profile_embedding: ProfileEmbedding) -> str:
+    """Return the raw JSON LLM ranking response, served from cache when possible"""
+    # Keep article order and numbering in the key: the response refers to articles by number
+    article_set = f"{offset}|" + "|".join(article.link for article in articles) + "|" + str(num_results)
+    key = hashlib.sha256(f"{RANKING_CACHE_VERSION}|{profile}|{article_set}".encode()).hexdigest()
+    if key in ranking_cache:
+        return ranking_cache[key]
+    stored = await ranking_store.get(key)
+    if stored is not None:
+        ranking_cache[key] = stored
+        return stored
+
+    # Join an identical request that is already waiting on the LLM
+    task = pending_rankings.get(key)
+    if task is None:
+        task = asyncio.create_task(fetch_ranking_response(key, article_set, profile, prompt, profile_embedding))
+        pending_rankings[key] = task
+        task.add_done_callback(lambda _: pending_rankings.pop(key, None))
+    # Shield so one cancelled caller does not cancel the call for the others
+    return await asyncio.shield(task)
+
+async def embed_profile(profile: str) -> Optional[List[float]]:
+    """Embed a profile for semantic cache lookups; None if the call fails"""
+    try:
+        return (await client.embeddings.create(
+            model="text-embedding-3-small",
+            input=profile
+        )).data[0].embedding
+    except Exception as e:
+        print(f"Error embedding profile: {str(e)}")
+        return None
+
+def shared_profile_embedding(profile: str) -> ProfileEmbedding:
+    """Return a getter that starts the profile embedding on first use and shares it after"""
+    task = None
+
+    def get():
+        nonlocal task
+        if task is None:
+            task = asyncio.create_task(embed_profile(profile))
+        return task
+
+    return get
+
+async def fetch_ranking_response(key: str, article_set: str, profile: str, prompt: str, profile_embedding: ProfileEmbedding) -> str:
+    """Get a ranking response for a profile similar to a cached one, or from the LLM"""
+    # The embedding runs alongside the LLM call; it is only awaited up front
+    # when there are cached profiles for these articles to compare against
+    embedding_task = profile_embedding()
+
+    # Look for a semantically similar profile ranked against the same articles
+    set_key = hashlib.sha256(article_set.encode()).hexdigest()
+    neighbours: List[Tuple[List[float], str]] = ranking_semantic_index.get(set_key, [])
+    embedding = await embedding_task if neighbours else None
+    if embedding is not None:
+        for cached_embedding, cached_text in neighbours:
+            # OpenAI embeddings are unit length, so the dot product is the cosine
+            similarity = sum(a * b for a, b in zip(embedding, cached_embedding))
+            if similarity >= SEMANTIC_CACHE_THRESHOLD:
+                ranking_cache[key] = cached_text
+                return cached_text
+
+    # Get LLM response
+    response = await client.beta.chat.completions.parse(
+        model=RANKING_MODEL,
+        messages=[
+            {"role": "system", "content": RANKING_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        response_format=RankingOutput,
+        temperature=0.3,
+        # Route requests for the same profile to the same prompt cache shard
+        extra_body={"prompt_cache_key": hashlib.sha256(profile.encode()).hexdigest()[:32]}
+    )
+    message = response.choices[0].message
+    # A refusal has no content; fail this call rather than cache an empty answer
+    if message.refusal or message.parsed is None:
+        raise ValueError(f"LLM returned no ranking: {message.refusal or 'empty response'}")
+    response_text = message.content
+
+    ranking_cache[key] = response_text
+    await ranking_store.set(key, response_text)
+    embedding = await embedding_task
+    if embedding is not None:
+        # Re-read the index: other profiles may have been added during the LLM call
+        neighbours = ranking_semantic_index.get(set_key, []) + [(embedding, response_text)]
+        ranking_semantic_index[set_key] = neighbours[-SEMANTIC_CACHE_MAX_NEIGHBOURS:]
+    return response_text
 
-def rank_articles_by_profile(articles: List[Article], profile: str, num_results: int) -> SearchResponse:
+async def rank_chunk(articles: List[Article], profile: str, num_results: int, offset: int, profile_embedding: ProfileEmbedding) -> Tuple[List[RankedArticle], str]:
+    """Rank one group of articles with a single LLM call; article numbers start after offset"""
+    # Prepare the prompt for the LLM in one buffer, without intermediate strings
+    buf = io.StringIO()
+    buf.write("User Profile:\n")
+    buf.write(profile)
+    buf.write("\n\nArticles:\n")
+    for i, article in enumerate(articles):
+        if i:
+            buf.write("\n\n")
+        # Number articles by their position in the full list, so the LLM's
+        # explanations and summary refer to the ids shown to the user
+        buf.write(f"Article {offset+i+1}:\nTitle: {article.title}\nSummary: {article.description}")
+    prompt = buf.getvalue()
+
+    # Get LLM response
+    response_text = await get_ranking_response(articles, profile, num_results, offset, prompt, profile_embedding)
+
+    # Parse the response
+    parsed = RankingOutput.model_validate_json(response_text)
+
+    # Create ranked articles
+    # Popping also ignores any article the LLM ranked more than once
+    articles_by_num = {offset+i+1: article for i, article in enumerate(articles)}
+    ranked_articles = []
+    for item in parsed.rankings:
+        article = articles_by_num.pop(item.article_num, None)
+        if article is None:
+            continue
+        ranked_article = to_ranked_article(
+            article,
+            item.score,
+            item.explanation,
+            item.article_num  # Preserve the original article number
+        )
+        ranked_articles.append(ranked_article)
+
+    return ranked_articles, parsed.summary
+
+async def rank_articles_by_profile(articles: List[Article], profile: str, num_results: int) -> SearchResponse:
     """Use LLM to rank articles based on user profile"""
+    # Duplicates only cost prompt tokens and crowd out distinct results
+    articles = dedupe_articles(articles)
+
     if not profile:
         return SearchResponse(
-            articles=[RankedArticle(**article.dict(), score=0.0, reasoning="No profile provided", article_id=i+1) for i, article in enumerate(articles[:num_results])],
+            articles=[to_ranked_article(article, 0.0, "No profile provided", i+1) for i, article in enumerate(articles[:num_results])],
             llm_reasoning="No profile was provided for ranking."
         )
     
     try:
-        # Prepare the prompt for the LLM
-        articles_text = "\n\n".join([
-            f"Article {i+1}:\nTitle: {article.title}\nSummary: {article.description}"
-            for i, article in enumerate(articles)
-        ])
-        
-        prompt = f"""Given the following user profile and list of articles, analyze and rank the articles based on their relevance to the user's research profile, expertise, and interests.
-
-User Profile:
-{profile}
+        # Large result sets are ranked in smaller chunks concurrently, trading
+        # some global consistency of scores for much lower latency
+        chunk_size = RANKING_CHUNK_SIZE if len(articles) > CHUNKED_RANKING_THRESHOLD else max(len(articles), 1)
+        # Every chunk ranks against the same profile, so embed it at most once
+        profile_embedding = shared_profile_embedding(profile)
+        starts = range(0, len(articles), chunk_size)
+        chunk_results = await asyncio.gather(*[
+            rank_chunk(articles[start:start + chunk_size], profile, num_results, start, profile_embedding)
+            for start in starts
+        ], return_exceptions=True)
 
-Articles:
-{articles_text}
-
-For each article, provide:
-1. A relevance score (0-100)
-2. A brief explanation of why this article matches or doesn't match the profile
-
-Format your response as follows:
-RANKINGS:
-1: [article number], [score]
-2: [article number], [score]
-(etc.)
-
-EXPLANATIONS:
-[article number]: [explanation]
-[article number]: [explanation]
-(etc.)
-
-SUMMARY:
-[Brief overall explanation of your ranking decisions]"""
-
-        # Get LLM response
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini-2025-04-14",
-            messages=[
-                {"role": "system", "content": "You are a research paper recommendation system. Your task is to analyze articles and match them with a user's research profile. Provide detailed reasoning for your selections."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3
-        )
-
-        # Parse the response
-        response_text = response.choices[0].message.content
-        sections = response_text.split('\n\n')
-        
-        # Parse rankings
-        rankings_section = next(s for s in sections if s.startswith('RANKINGS:'))
-        rankings = {}
-        for line in rankings_section.split('\n')[1:]:  # Skip the "RANKINGS:" header
-            if ':' in line:
-                num, score = line.split(':')[1].split(',')
-                rankings[int(num.strip())] = float(score.strip())
-
-        # Parse explanations
-        explanations_section = next(s for s in sections if s.startswith('EXPLANATIONS:'))
-        explanations = {}
-        for line in explanations_section.split('\n')[1:]:  # Skip the "EXPLANATIONS:" header
-            if ':' in line:
-                num, explanation = line.split(':', 1)
-                explanations[int(num.strip())] = explanation.strip()
-
-        # Get summary
-        summary_section = next(s for s in sections if s.startswith('SUMMARY:'))
-        summary = summary_section.replace('SUMMARY:', '').strip()
-
-        # Create ranked articles
+        # A failed chunk only degrades its own articles, not the whole ranking
         ranked_articles = []
-        for article_num, score in rankings.items():
-            if article_num - 1 < len(articles):
-                article = articles[article_num - 1]
-                ranked_article = RankedArticle(
-                    **article.dict(),
-                    score=score,
-                    reasoning=explanations.get(article_num, "No explanation provided"),
-                    article_id=article_num  # Preserve the original article number
+        summaries = []
+        for start, result in zip(starts, chunk_results):
+            if isinstance(result, BaseException):
+                chunk = articles[start:start + chunk_size]
+                print(f"Error in LLM ranking: {str(result)}")
+                ranked_articles.extend(
+                    to_ranked_article(article, 0.0, "Ranking failed", start+i+1)
+                    for i, article in enumerate(chunk)
                 )
-                ranked_articles.append(ranked_article)
+                if len(starts) == 1:
+                    summaries.append(f"Error during ranking: {str(result)}")
+                else:
+                    summaries.append(f"Error during ranking of articles {start+1}-{start+len(chunk)}: {str(result)}")
+            else:
+                chunk_articles, summary = result
+                ranked_articles.extend(chunk_articles)
+                summaries.append(summary)
 
-        # Sort by score and take top num_results
-        ranked_articles.sort(key=lambda x: x.score, reverse=True)
-        ranked_articles = ranked_articles[:num_results]
+        # Take the top num_results by score
+        ranked_articles = heapq.nlargest(num_results, ranked_articles, key=lambda x: x.score)
 
         return SearchResponse(
             articles=ranked_articles,
-            llm_reasoning=summary
+            llm_reasoning="\n\n".join(summaries)
         )
 
     except Exception as e:
         print(f"Error in LLM ranking: {str(e)}")
         return SearchResponse(
-            articles=[RankedArticle(**article.dict(), score=0.0, reasoning="Ranking failed", article_id=i+1) for i, article in enumerate(articles[:num_results])],
+            articles=[to_ranked_article(article, 0.0, "Ranking failed", i+1) for i, article in enumerate(articles[:num_results])],
             llm_reasoning=f"Error during ranking: {str(e)}"
         )
 
+def _collect_arxiv(query: str, max_results: int) -> List[Article]:
+    """Run an arxiv search and collect the results (blocking)"""
+    # Create the search with proper parameters
+    search = arxiv.Search(
+        query=query,
+        max_results=max_results,
+        sort_by=arxiv.SortCriterion.Relevance,
+        sort_order=arxiv.SortOrder.Descending
+    )
+    
+    # Collect all results
+    return [
+        Article(
+            title=result.title,
+            description=result.summary,
+            link=result.entry_id,
+            published=str(result.published)
+        )
+        for result in itertools.islice(search.results(), max_results)
+    ]
+
+async def _fetch_arxiv(query: str, max_results: int) -> List[Article]:
+    """Fetch arxiv search results, reusing recent results for the same query"""
+    # Only whitespace is normalized: arxiv's AND/OR/ANDNOT operators are case-sensitive
+    normalized_query = " ".join(query.split())
+    key = (normalized_query, max_results)
+    if key in arxiv_cache:
+        return arxiv_cache[key]
+    store_key = f"{ARXIV_CACHE_VERSION}|{normalized_query}|{max_results}"
+    stored = await arxiv_store.get(store_key)
+    if stored is not None:
+        results = ARTICLE_LIST.validate_json(stored)
+        arxiv_cache[key] = results
+        return results
+
+    # The arxiv client does synchronous HTTP, so keep it off the event loop
+    results = await asyncio.to_thread(_collect_arxiv, query, max_results)
+
+    arxiv_cache[key] = results
+    await arxiv_store.set(store_key, ARTICLE_LIST.dump_json(results).decode())
+    return results
+
 @app.get("/search/{query}")
 async def search_articles(
     query: str,
@@ -166,29 +477,10 @@ async def search_articles(
         # Clean and format the query
         query = query.strip()
         
-        # Create the search with proper parameters
-        search = arxiv.Search(
-            query=query,
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.Relevance,
-            sort_order=arxiv.SortOrder.Descending
-        )
-        
-        # Collect all results
-        results = []
-        for result in search.results():
-            article = Article(
-                title=result.title,
-                description=result.summary,
-                link=result.entry_id,
-                published=str(result.published)
-            )
-            results.append(article)
-            if len(results) >= max_results:
-                break
+        results = await _fetch_arxiv(query, max_results)
         
         # Filter results based on profile if provided
-        search_response = rank_articles_by_profile(results, profile, display_results)
+        search_response = await rank_articles_by_profile(results, profile, display_results)
         
         return search_response
     except Exception as e:
@@ -200,33 +492,29 @@ async def save_articles(articles: List[Article]):
         # Get today's folder
         folder_path = get_today_folder()
         
-        # Download PDFs for each article
+        # One download per paper: concurrent tasks for the same ID would race
+        # on the same .part file
+        articles = list({get_arxiv_id(article.link): article for article in articles}.values())
+
+        # Download all PDFs concurrently over the shared connection pool
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(download_one(app.state.http, article, folder_path))
+                for article in articles
+            ]
+
         saved_files = []
-        for article in articles:
-            try:
-                # Extract the arxiv ID from the link
-                arxiv_id = article.link.split('/')[-1]
-                
-                # Create a search for this specific paper
-                search = arxiv.Search(id_list=[arxiv_id])
-                result = next(search.results())
-                
-                # Download the PDF
-                safe_title = sanitize_filename(article.title)
-                
-                # Download to temp location
-                result.download_pdf(folder_path, f"{arxiv_id}.pdf")
-                
-                
-            except Exception as article_error:
-                print(f"Error processing article {article.title}: {str(article_error)}")
+        for article, task in zip(articles, tasks):
+            file_name, article_error = task.result()
+            if article_error is not None:
                 raise HTTPException(
                     status_code=500,
                     detail=f"Error processing article {article.title}: {str(article_error)}"
                 )
+            saved_files.append(file_name)
         
         return {
-            "message": f"Articles saved as PDFs in {os.path.basename(folder_path)} folder",
+            "message": f"Articles saved as PDFs in {folder_path.name} folder",
             "saved_files": saved_files
         }
     except Exception as e:
@@ -235,4 +523,14 @@ async def save_articles(articles: List[Article]):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Workers must be given the app as an import string; each one gets its own
+    # event loop and in-memory caches
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=os.cpu_count(),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
+    ) 
\ No newline at end of file